@@ -1,6 +1,8 @@
 import builtins
-import ctypes
-import warnings
+import functools
+import operator
+import re
+import sys
 from collections.abc import Mapping, Sequence
 from numbers import Number
 from itertools import islice
@@ -9,6 +11,10 @@ import fishhook
 
 IDEAS = {}
 IS_IPYTHON = hasattr(builtins, "get_ipython")
+_CAMEL_RE = re.compile(r"(.?)([A-Z])")
+_NUMLIKE = (int, float, type(None))
+_SEQLIKE = (dict, tuple)
+_NUMERIC = (int, float)
 
 CHAR_SPLIT_MAP = {
     "w": "vv",
@@ -23,9 +29,13 @@ CHAR_SPLIT_MAP = {
     "D": "|)",
     # etc..
 }
+_LEFT_TRANS = str.maketrans({k: v[1] for k, v in CHAR_SPLIT_MAP.items()})
+_RIGHT_TRANS = str.maketrans({k: v[0] for k, v in CHAR_SPLIT_MAP.items()})
 
 
 class Idea:
+    __slots__ = ("enabled",)
+
     def __init__(self):
         self.enabled = None
 
@@ -37,20 +47,20 @@ class Idea:
 
 
 def camelize(match):
-    a, b = match.groups()
-    return f"{a}_{b.lower()}" if a else b.lower()
+    a = match[1]
+    return f"{a}_{match[2].lower()}" if a else match[2].lower()
 
 
 def register(cls):
-    import re
-
     inst = cls()
-    IDEAS[re.sub(r"(.?)([A-Z])", camelize, cls.__name__)] = inst
+    IDEAS[_CAMEL_RE.sub(camelize, cls.__name__)] = inst
     return inst
 
 
 @register
 class DictSort(Idea):
+    __slots__ = ()
+
     def enable(self):
         @fishhook.hook(dict)
         def sort(self, key=None):
@@ -68,10 +78,12 @@ class DictSort(Idea):
 
 @register
 class IterableInt(Idea):
+    __slots__ = ()
+
     def enable(self):
         @fishhook.hook(int)
-        def __iter__(self):
-            return iter(range(self))
+        def __iter__(self, _range=range, _iter=iter):
+            return _iter(_range(self))
 
         super().enable()
 
@@ -82,6 +94,8 @@ class IterableInt(Idea):
 
 @register
 class SpellcheckClasses(Idea):
+    __slots__ = ()
+
     def enable(self):
         import spelcheck
 
@@ -98,23 +112,33 @@ class SpellcheckClasses(Idea):
 
 @register
 class FloatSlicing(Idea):
+    __slots__ = ()
+
     def enable(self):
+        orig_getitem = str.__getitem__
+
         @fishhook.hook(str)
-        def __getitem__(self, something):
+        def __getitem__(self, something, _orig=orig_getitem, _int=int):
             if not isinstance(something, slice):
-                return fishhook.orig(self, something)
+                return _orig(self, something)
             start, stop, step = something.start, something.stop, something.step
+            if (start is None or type(start) is _int) and (
+                stop is None or type(stop) is _int
+            ):
+                return _orig(self, something)
             split_start = start % 1 == 0.5 if start else False
             split_stop = stop % 1 == 0.5 if stop else False
             if split_start:
                 start = int(start)
             if split_stop:
                 stop = int(stop) + 1
-            res = fishhook.orig(self, slice(start, stop, step))
+            if split_start or split_stop:
+                something = slice(start, stop, step)
+            res = _orig(self, something)
             if split_start:
-                res = CHAR_SPLIT_MAP.get(res[0], (..., res[0]))[1] + res[1:]
+                res = res[0].translate(_LEFT_TRANS) + res[1:]
             if split_stop:
-                res = res[:-1] + CHAR_SPLIT_MAP.get(res[-1], (res[-1], ...))[0]
+                res = res[:-1] + res[-1].translate(_RIGHT_TRANS)
             return res
 
         super().enable()
@@ -124,19 +148,90 @@ class FloatSlicing(Idea):
         super().disable()
 
 
+def _parse_number(s):
+    if len(s) <= 32:
+        return _parse_short_number(s)
+    return _parse_number_uncached(s)
+
+
+def _parse_number_uncached(s):
+    try:
+        return int(s)
+    except ValueError:
+        try:
+            return float(s)
+        except ValueError:
+            return None
+
+
+_parse_short_number = functools.lru_cache(maxsize=1024)(_parse_number_uncached)
+
+
+def _make_dict_op(op, reflected=False):
+    def impl(
+        self,
+        other,
+        _op=op,
+        _reflected=reflected,
+        _Mapping=Mapping,
+        _Sequence=Sequence,
+        _Number=Number,
+    ):
+        _isinstance = isinstance
+        if _isinstance(other, _Mapping):
+            res = dict(self)
+            for k, v in other.items():
+                old = res.get(k)
+                if _isinstance(old, _Number) and _isinstance(v, _Number):
+                    res[k] = _op(old, v)
+                else:
+                    res[k] = v
+            return res
+
+        if _isinstance(other, _Sequence):
+            return _op(self, dict(other))
+
+        if _isinstance(other, _Number):
+            if len(self) >= 64 and type(other) in (int, float) and other:
+                # importing numpy with these hooks active crashes, so it's only
+                # used if it was imported beforehand:
+                numpy = sys.modules.get("numpy")
+                if numpy:
+                    vals = list(self.values())
+                    if all(type(v) is float for v in vals):
+                        with numpy.errstate(all="ignore"):
+                            res = _op(numpy.array(vals), other)
+                        return dict(zip(self, res.tolist()))
+            return {
+                k: (_op(v, other) if _isinstance(v, _Number) else v)
+                for k, v in self.items()
+            }
+        elif _reflected:
+            return NotImplemented
+        else:
+            return self
+
+    return impl
+
+
 @register
 class WeakTyping(Idea):
+    __slots__ = ()
+
     def enable(self):
+        # calling the original slot wrappers directly skips fishhook.orig's
+        # search for the calling hook on every fallthrough:
+        orig_str_add = str.__add__
+        orig_list_add = list.__add__
+
         @fishhook.hook(str)
-        def __add__(self, other):
-            if isinstance(other, (int, float, type(None))):
-                try:
-                    val = int(self)
-                except ValueError:
-                    try:
-                        val = float(self)
-                    except ValueError:
-                        return self + str(other)
+        def __add__(
+            self, other, _NUMLIKE=_NUMLIKE, _orig=orig_str_add, _parse=_parse_number
+        ):
+            if isinstance(other, _NUMLIKE):
+                val = _parse(self)
+                if val is None:
+                    return _orig(self, str(other))
                 return val + other
             elif isinstance(other, list):
                 return [self, *other]
@@ -144,147 +239,50 @@ class WeakTyping(Idea):
                 return tuple(self, *other)
             elif isinstance(other, dict):
                 return {self: None, **other}
-            return fishhook.orig(self, other)
-
-        @fishhook.hook(dict)
-        def __add__(self, other):
-            if isinstance(other, Mapping):
-                res = {}
-                for k in self.keys() | other.keys():
-                    if k in self and k not in other:
-                        res[k] = self[k]
-                    elif k not in self and k in other:
-                        res[k] = other[k]
-                    elif isinstance(self[k], Number) and isinstance(other[k], Number):
-                        res[k] = self[k] + other[k]
-                    else:
-                        res[k] = other[k]
-                return res
-
-            if isinstance(other, Sequence):
-                return self + dict(other)
-
-            if isinstance(other, Number):
-                res = self.copy()
-                for k, v in res.items():
-                    if isinstance(v, Number):
-                        res[k] = v + other
-                return res
-            else:
-                return self
-        fishhook.hook(dict, name="__radd__")(__add__)
-
-        @fishhook.hook(dict)
-        def __mul__(self, other):
-            if isinstance(other, Mapping):
-                res = {}
-                for k in self.keys() | other.keys():
-                    if k in self and k not in other:
-                        res[k] = self[k]
-                    elif k not in self and k in other:
-                        res[k] = other[k]
-                    elif isinstance(self[k], Number) and isinstance(other[k], Number):
-                        res[k] = self[k] * other[k]
-                    else:
-                        res[k] = other[k]
-                return res
-
-            if isinstance(other, Sequence):
-                return self * dict(other)
-
-            if isinstance(other, Number):
-                res = self.copy()
-                for k, v in res.items():
-                    if isinstance(v, Number):
-                        res[k] = v * other
-                return res
-            else:
-                return self
-        fishhook.hook(dict, name="__rmul__")(__mul__)
-
-        @fishhook.hook(dict)
-        def __truediv__(self, other):
-            if isinstance(other, Mapping):
-                res = {}
-                for k in self.keys() | other.keys():
-                    if k in self and k not in other:
-                        res[k] = self[k]
-                    elif k not in self and k in other:
-                        res[k] = other[k]
-                    elif isinstance(self[k], Number) and isinstance(other[k], Number):
-                        res[k] = self[k] / other[k]
-                    else:
-                        res[k] = other[k]
-                return res
-
-            if isinstance(other, Sequence):
-                return self / dict(other)
-
-            if isinstance(other, Number):
-                res = self.copy()
-                for k, v in res.items():
-                    if isinstance(v, Number):
-                        res[k] = v / other
-                return res
-            else:
-                return self
-
-        @fishhook.hook(dict)
-        def __sub__(self, other):
-            if isinstance(other, Mapping):
-                res = {}
-                for k in self.keys() | other.keys():
-                    if k in self and k not in other:
-                        res[k] = self[k]
-                    elif k not in self and k in other:
-                        res[k] = other[k]
-                    elif isinstance(self[k], Number) and isinstance(other[k], Number):
-                        res[k] = self[k] - other[k]
-                    else:
-                        res[k] = other[k]
-                return res
-
-            if isinstance(other, Sequence):
-                return self - dict(other)
-
-            if isinstance(other, Number):
-                res = self.copy()
-                for k, v in res.items():
-                    if isinstance(v, Number):
-                        res[k] = v - other
-                return res
-            else:
-                return self
+            return _orig(self, other)
+
+        # all of these are installed in a single pass over dict's slots (built
+        # with type() so no compiler-added names like __firstlineno__ leak onto
+        # dict):
+        dict_hooks = type(
+            "dict_hooks",
+            (),
+            {
+                "__add__": _make_dict_op(operator.add),
+                "__radd__": _make_dict_op(operator.add, reflected=True),
+                "__sub__": _make_dict_op(operator.sub),
+                "__mul__": _make_dict_op(operator.mul),
+                "__rmul__": _make_dict_op(operator.mul, reflected=True),
+                "__truediv__": _make_dict_op(operator.truediv),
+            },
+        )
+        fishhook.hook_cls(dict)(dict_hooks)
 
         @fishhook.hook(str)
-        def __sub__(self, other):
-            error = TypeError(
+        def __sub__(self, other, _NUMERIC=_NUMERIC, _parse=_parse_number):
+            if isinstance(other, _NUMERIC):
+                val = _parse(self)
+                if val is not None:
+                    return val - other
+            raise TypeError(
                 f"unsupported operand type(s) for -: 'str' and {type(other).__name__!r}"
             )
-            if isinstance(other, (int, float)):
-                try:
-                    val = int(self)
-                except ValueError:
-                    try:
-                        val = float(self)
-                    except ValueError:
-                        raise error
-                return val - other
-            raise error
 
         if not IS_IPYTHON:
 
             @fishhook.hook(list)
-            def __add__(self, other):
-                if isinstance(other, (int, float, type(None))):
+            def __add__(
+                self, other, _NUMLIKE=_NUMLIKE, _SEQLIKE=_SEQLIKE, _orig=orig_list_add
+            ):
+                if isinstance(other, _NUMLIKE):
                     return [*self, other]
                 elif other is Ellipsis:
                     new = [*self]
                     new.append(new)
                     return new
-                elif isinstance(other, (dict, tuple)):
+                elif isinstance(other, _SEQLIKE):
                     return [*self, *other]
-                return fishhook.orig(self, other)
+                return _orig(self, other)
 
         super().enable()
 
@@ -304,7 +302,11 @@ class WeakTyping(Idea):
 
 @register
 class MutableTuples(Idea):
+    __slots__ = ()
+
     def enable(self):
+        import ctypes
+
         @fishhook.hook(tuple)
         def __setitem__(self, idx, item):
             if isinstance(idx, slice):
@@ -339,7 +341,11 @@ class MutableTuples(Idea):
 
 @register
 class MutableStrings(Idea):
+    __slots__ = ()
+
     def enable(self):
+        import ctypes
+
         # size is always in position 16?
         def get_size(s):
             return ctypes.c_long.from_address(id(s) + 16).value
@@ -349,28 +355,42 @@ class MutableStrings(Idea):
 
         fishhook.hook(str, name="size")(property(fget=get_size, fset=set_size))
 
+        # the kind is stored in bits 2-4 of the state field after the hash
         def unicode_kind(s):
-            c = ord(max(s))
-            if c < 256:
-                return 1
-            elif c < 256*256:
-                return 2
-            else:
-                return 4
+            return (ctypes.c_uint.from_address(id(s) + 32).value >> 2) & 7
+
+        char_types = {1: ctypes.c_uint8, 2: ctypes.c_uint16, 4: ctypes.c_uint32}
+
+        # compact strings keep their characters right after the header, which
+        # is bigger for non-ASCII strings. The sizes are measured on fresh
+        # strings, since getsizeof also counts cached UTF-8/wstr copies:
+        ascii_header = sys.getsizeof("") - 1
+        compact_header = sys.getsizeof(chr(256)) - 2 * 2
+
+        def chars(s):
+            data = id(s) + (ascii_header if s.isascii() else compact_header)
+            return (char_types[unicode_kind(s)] * len(s)).from_address(data)
 
         @fishhook.hook(str)
         def __setitem__(self, item, value):
             if isinstance(item, slice):
-                for i, char in zip(range(item.start or 0, item.stop or 999, item.step or 1), value):
-                    self[i] = char
+                start, stop, step = item.start or 0, item.stop or 999, item.step or 1
+                if (
+                    step == 1
+                    and isinstance(value, str)
+                    and value.isascii()
+                    and self.isascii()
+                ):
+                    count = max(0, min(len(value), stop - start))
+                    if 0 <= start <= len(self) - count:
+                        dst = ctypes.addressof(chars(self)) + start
+                        ctypes.memmove(dst, ctypes.addressof(chars(value)), count)
+                        return
+                view = chars(self)
+                for i, char in zip(range(start, stop, step), value):
+                    view[i] = ord(char)
                 return
-            kind = unicode_kind(self)
-            if kind == 1:
-                ctypes.c_uint8.from_address(id(self) + 48 + item).value = ord(value)
-            elif kind == 2:
-                ctypes.c_uint16.from_address(id(self) + 48 + item).value = ord(value)
-            elif kind == 4:
-                ctypes.c_uint32.from_address(id(self) + 48 + item).value = ord(value)
+            chars(self)[item] = ord(value)
 
         super().enable()
 
@@ -382,6 +402,8 @@ class MutableStrings(Idea):
 
 @register
 class DictSlicing(Idea):
+    __slots__ = ()
+
     def enable(self):
         # for some reason, just using fishhook.orig crashes when _both_ the
         # following hooks are defined (only one is fine). It works if we first
@@ -415,4 +437,5 @@ def __getattr__(attr):
     idea = IDEAS[attr]
     if idea.enabled is None:
         idea.enable()
+    globals()[attr] = idea
     return idea